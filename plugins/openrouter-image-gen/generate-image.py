@@ -1,7 +1,16 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.11"
-# dependencies = ["requests", "rich"]
+# dependencies = [
+#     "requests",
+#     "requests-toolbelt",
+#     "brotli",
+#     "rich",
+#     "orjson",
+#     "ijson",
+#     "pybase64",
+#     "msgspec",
+# ]
 # ///
 """
 Generate images via OpenRouter's image generation API.
@@ -10,18 +19,47 @@ Uses the chat completions endpoint with image modalities.
 
 import argparse
 import base64
+import binascii
+import functools
+import hashlib
 import json
-import mimetypes
 import os
+import re
 import shutil
 import sys
-from datetime import datetime
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
-
-import requests
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
+from typing import TYPE_CHECKING, Any, TypedDict
+
+# requests and rich are imported lazily by the functions that need them, so
+# --help and local-only commands like --list-sessions start quickly
+if TYPE_CHECKING:
+    import requests
+    from rich.console import Console
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    from pybase64 import b64decode
+except ImportError:
+    from base64 import b64decode
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 DEFAULT_MODEL = "google/gemini-3-pro-image-preview"
@@ -33,11 +71,39 @@ CONFIG_LOCATIONS = [
     Path.home() / ".openrouter-config",
 ]
 
+# Matches KEY=value lines in a config file; comment lines and blank values never match
+CONFIG_LINE_RE = re.compile(r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(\S.*?)[ \t\r]*$", re.MULTILINE)
+
 # Use XDG state directory for all generated content
 XDG_STATE_HOME = Path(os.environ.get("XDG_STATE_HOME", Path.home() / ".local" / "state"))
 OUTPUT_DIR = XDG_STATE_HOME / "openrouter-image-gen" / "output"
 SESSIONS_DIR = XDG_STATE_HOME / "openrouter-image-gen" / "sessions"
 
+# Use XDG cache directory for data that can be refetched at any time
+XDG_CACHE_HOME = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+MODELS_CACHE_FILE = XDG_CACHE_HOME / "openrouter-image-gen" / "models.json"
+# ETag/Last-Modified of the cached catalog, used to revalidate it with a conditional GET
+MODELS_VALIDATORS_FILE = XDG_CACHE_HOME / "openrouter-image-gen" / "models.validators.json"
+# Seconds the cached catalog is used without asking the server at all
+# (override with OPENROUTER_MODELS_CACHE_TTL)
+DEFAULT_MODELS_CACHE_TTL = 3600
+# Generated images keyed by a hash of the request that produced them
+IMAGE_CACHE_DIR = XDG_CACHE_HOME / "openrouter-image-gen" / "images"
+
+# Each session keeps small metadata next to an append-only message log, so a
+# new turn only writes its own messages instead of the whole history
+SESSION_META_FILE = "meta.json"
+SESSION_LOG_FILE = "messages.jsonl"
+# Single-file format used before the message log; still read and migrated on save
+LEGACY_SESSION_FILE = "session.json"
+
+# Extensions of generated images kept in session folders
+IMAGE_SUFFIXES = (".png", ".jpg")
+
+# Litterbox URLs expire after an hour; an uploaded session image is reused only
+# while its URL is comfortably short of that
+UPLOAD_REUSE_SECONDS = 50 * 60
+
 ASPECT_RATIOS = {
     "1:1": "1024×1024",
     "2:3": "832×1248",
@@ -50,29 +116,102 @@ ASPECT_RATIOS = {
     "16:9": "1344×768",
     "21:9": "1536×672",
 }
+ASPECT_RATIO_KEYS = tuple(ASPECT_RATIOS)
 
 IMAGE_SIZES = ["1K", "2K", "4K"]
 
-console = Console()
+# Connections kept per host by the shared HTTP session. Concurrent uploads and
+# downloads use at most this many workers, so every request reuses a pooled
+# connection instead of opening (and then discarding) an extra one.
+HTTP_POOL_SIZE = 8
+# Bytes read per chunk when streaming HTTP response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Base64 data URLs are decoded in blocks of this many characters. It must be
+# a multiple of 4 so that block boundaries never split a base64 quantum.
+B64_DECODE_CHUNK = 4 * 64 * 1024
+# Longest data URL header (e.g. "data:image/png;base64,") searched for the comma
+DATA_URL_HEADER_MAX = 256
+
+
+@functools.lru_cache(maxsize=1)
+def get_console() -> "Console":
+    """Get the shared rich console, importing rich on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+# lru_cache doesn't serialize concurrent first calls, and the first call may come
+# from upload or download worker threads
+HTTP_SESSION_LOCK = threading.Lock()
+
+
+def get_http_session() -> "requests.Session":
+    """Get the shared HTTP session, which pools connections and retries transient errors."""
+    with HTTP_SESSION_LOCK:
+        return create_http_session()
 
 
+@functools.lru_cache(maxsize=1)
+def create_http_session() -> "requests.Session":
+    """Create the HTTP session returned by get_http_session."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # Only idempotent requests are retried on these statuses, so a generation
+    # POST is never silently repeated (and billed) twice
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "HTTP-Referer": "https://github.com/anthropics/claude-code",
+        "X-Title": "Claude Code Image Generation",
+    })
+    return session
+
+
+def json_loads(data: bytes) -> Any:
+    """Parse JSON from raw bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+@functools.lru_cache(maxsize=1)
 def load_api_key() -> str:
-    """Load the OpenRouter API key from environment or config file."""
-    # Check environment variable first
+    """Load the OpenRouter API key from environment or config file (cached per process)."""
+    # Check environment variable first, so the common case never touches the filesystem
     api_key = os.environ.get("OPENROUTER_API_KEY")
     if api_key:
         return api_key
 
-    # Search config file locations
-    config_file = None
-    for path in CONFIG_LOCATIONS:
-        if path.exists():
-            config_file = path
-            break
+    # Search config file locations; each probe is a single stat(), which is cheaper
+    # than listing their (distinct) parent directories
+    config_file = next((path for path in CONFIG_LOCATIONS if path.is_file()), None)
 
     if not config_file:
+        from rich.panel import Panel
+
         locations = "\n".join(f"  - {p}" for p in CONFIG_LOCATIONS)
-        console.print(
+        get_console().print(
             Panel(
                 f"OpenRouter API key not found.\n\n"
                 f"Set the OPENROUTER_API_KEY environment variable, or create a config file at one of:\n"
@@ -85,16 +224,11 @@ def load_api_key() -> str:
         )
         sys.exit(1)
 
-    config = {}
-    for line in config_file.read_text().splitlines():
-        line = line.strip()
-        if line and not line.startswith("#") and "=" in line:
-            key, value = line.split("=", 1)
-            config[key.strip()] = value.strip()
+    config = dict(CONFIG_LINE_RE.findall(config_file.read_text()))
 
     api_key = config.get("OPENROUTER_API_KEY")
     if not api_key or api_key == "your-api-key-here":
-        console.print(f"[red]Error:[/red] OPENROUTER_API_KEY not set in {config_file}")
+        get_console().print(f"[red]Error:[/red] OPENROUTER_API_KEY not set in {config_file}")
         sys.exit(1)
 
     return api_key
@@ -102,66 +236,353 @@ def load_api_key() -> str:
 
 def upload_to_litterbox(image_path: Path, expiry: str = "1h") -> str:
     """Upload an image to Litterbox temporary hosting and return the URL."""
+    import mimetypes
+
+    from requests_toolbelt import MultipartEncoder
+
+    content_type = mimetypes.guess_type(image_path.name)[0] or "application/octet-stream"
     with open(image_path, "rb") as f:
-        response = requests.post(
+        # Stream the multipart body from disk rather than buffering the whole image
+        body = MultipartEncoder(fields={
+            "reqtype": "fileupload",
+            "time": expiry,
+            "fileToUpload": (image_path.name, f, content_type),
+        })
+        response = get_http_session().post(
             "https://litterbox.catbox.moe/resources/internals/api.php",
-            data={"reqtype": "fileupload", "time": expiry},
-            files={"fileToUpload": (image_path.name, f)},
+            data=body,
+            headers={"Content-Type": body.content_type},
             timeout=60,
         )
         response.raise_for_status()
         return response.text.strip()
 
 
+def write_file(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write chunks straight to a file descriptor, removing the file if writing fails.
+
+    Bypasses Python's buffered file object so each chunk costs a single write(2).
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        for chunk in chunks:
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view) :]
+    except BaseException:
+        os.close(fd)
+        path.unlink(missing_ok=True)
+        raise
+    os.close(fd)
+
+
+def write_data_url(data_url: str, file_path: Path) -> None:
+    """Decode a base64 data URL to a file without materializing the full image."""
+    # Only search the header, so a malformed multi-megabyte URL fails fast
+    comma = data_url.find(",", 5, DATA_URL_HEADER_MAX)
+    if comma == -1 or not data_url[:comma].endswith(";base64"):
+        raise ValueError("not a base64 data URL")
+    start = comma + 1
+    try:
+        write_file(
+            file_path,
+            (
+                b64decode(data_url[offset : offset + B64_DECODE_CHUNK])
+                for offset in range(start, len(data_url), B64_DECODE_CHUNK)
+            ),
+        )
+    except binascii.Error:
+        # Line-wrapped base64 doesn't split into aligned blocks; decode it whole,
+        # skipping the whitespace like a plain b64decode does
+        write_file(file_path, [b64decode(data_url[start:])])
+
+
+def download_image(url: str, file_path: Path) -> None:
+    """Stream an image URL to a file using the shared HTTP session."""
+    with get_http_session().get(url, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        write_file(file_path, response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+
+
+def save_image(image_url: str, file_path: Path) -> None:
+    """Save a generated image, given as a base64 data URL or a remote URL."""
+    # Replace rather than overwrite in place: an earlier file of the same name
+    # may be hardlinked into a session folder or the image cache
+    file_path.unlink(missing_ok=True)
+    if image_url.startswith("data:"):
+        write_data_url(image_url, file_path)
+    else:
+        download_image(image_url, file_path)
+
+
+def read_completion_message(response: "requests.Response") -> dict | None:
+    """Get the first choice's message from a chat completion response, or None if absent.
+
+    With ijson installed the body is parsed incrementally as it streams in, so the
+    raw response and the full document tree are never held alongside the images.
+    """
+    if ijson is None:
+        choices = json_loads(response.content).get("choices") or []
+        return choices[0].get("message", {}) if choices else None
+
+    messages = ijson.sendable_list()
+    parser = ijson.items_coro(messages, "choices.item.message", use_float=True)
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            parser.send(chunk)
+            if messages:
+                # Only the first choice is used, so stop reading once it is complete
+                response.close()
+                return messages[0]
+        parser.close()
+    except ijson.JSONError as e:
+        raise ValueError(f"Malformed JSON response: {e}") from e
+    return None
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    """Hardlink src to dest, falling back to a copy when linking isn't possible."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def output_paths(output_file: str | None, count: int) -> list[Path]:
+    """Return the output paths for count generated images."""
+    # Generate base filename if not provided
+    if output_file:
+        base_name = Path(output_file).stem
+        extension = Path(output_file).suffix or ".png"
+    else:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        base_name = f"image_{timestamp}"
+        extension = ".png"
+
+    if count == 1:
+        return [OUTPUT_DIR / f"{base_name}{extension}"]
+    return [OUTPUT_DIR / f"{base_name}_{i + 1}{extension}" for i in range(count)]
+
+
+def image_cache_key(model: str, prompt: str, aspect_ratio: str | None, image_size: str | None) -> str:
+    """Return the image cache key for a generation request."""
+    return hashlib.blake2b(json_dumps([model, prompt, aspect_ratio, image_size]), digest_size=16).hexdigest()
+
+
+def cached_images(key: str) -> list[Path]:
+    """Return the cached images for a request key in result order, or [] on a miss."""
+    try:
+        with os.scandir(IMAGE_CACHE_DIR / key) as entries:
+            return sorted((Path(e.path) for e in entries if e.is_file()), key=lambda p: int(p.name))
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def store_cached_images(key: str, files: list[Path]) -> None:
+    """Hardlink generated images into the image cache, replacing any entry for key."""
+    import tempfile
+
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    entry_dir = IMAGE_CACHE_DIR / key
+    tmp_dir = Path(tempfile.mkdtemp(dir=IMAGE_CACHE_DIR))
+    old_dir: Path | None = None
+    try:
+        for n, file_path in enumerate(files, 1):
+            link_or_copy(file_path, tmp_dir / str(n))
+        # A directory can't be renamed onto a non-empty one, so move the old
+        # entry aside first
+        if entry_dir.exists():
+            old_dir = Path(tempfile.mkdtemp(dir=IMAGE_CACHE_DIR))
+            os.rename(entry_dir, old_dir)
+        # Publish the entry with one rename so readers never see a partial result
+        os.rename(tmp_dir, entry_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    finally:
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+
 # Session management functions
 def get_session_dir(name: str) -> Path:
     """Get the directory path for a named session."""
     return SESSIONS_DIR / name
 
 
+def get_session_mtime(session_dir: Path) -> float | None:
+    """Get when a session was last saved, or None if the path is not a session."""
+    for filename in (SESSION_META_FILE, LEGACY_SESSION_FILE):
+        try:
+            return (session_dir / filename).stat().st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return None
+
+
 def load_session(name: str) -> dict | None:
     """Load session state from disk. Returns None if session doesn't exist."""
     session_dir = get_session_dir(name)
-    session_file = session_dir / "session.json"
-    if not session_file.exists():
-        return None
-    return json.loads(session_file.read_text())
+    try:
+        meta = (session_dir / SESSION_META_FILE).read_bytes()
+    except FileNotFoundError:
+        try:
+            return json_loads((session_dir / LEGACY_SESSION_FILE).read_bytes())
+        except FileNotFoundError:
+            return None
+
+    data = json_loads(meta)
+    message_count = data.pop("message_count", 0)
+    log_size = data.pop("log_size", 0)
+    try:
+        with open(session_dir / SESSION_LOG_FILE, "rb") as f:
+            # Ignore anything past the recorded size (left by an interrupted save)
+            log = f.read(log_size)
+    except FileNotFoundError:
+        log = b""
+    lines = log.splitlines()
+    if log and len(log) < log_size and not log.endswith(b"\n"):
+        # A log cut short may end mid-message; keep only the complete ones
+        lines.pop()
+    data["messages"] = [json_loads(line) for line in lines[:message_count]]
+    return data
 
 
 def save_session(name: str, data: dict) -> None:
-    """Save session state to disk."""
+    """Save session state to disk, appending only messages not already logged."""
     session_dir = get_session_dir(name)
     session_dir.mkdir(parents=True, exist_ok=True)
-    session_file = session_dir / "session.json"
-    session_file.write_text(json.dumps(data, indent=2))
+    meta_file = session_dir / SESSION_META_FILE
+    try:
+        previous = json_loads(meta_file.read_bytes())
+    except FileNotFoundError:
+        previous = {}
+    message_count = previous.get("message_count", 0)
+    log_size = previous.get("log_size", 0)
+
+    messages = data.get("messages", [])
+    with open(session_dir / SESSION_LOG_FILE, "ab") as f:
+        # If the log is missing or shorter than the meta says, the loaded messages
+        # didn't come from it in full; rewrite the whole log rather than pad it
+        if f.seek(0, os.SEEK_END) < log_size or len(messages) < message_count:
+            message_count = log_size = 0
+        f.truncate(log_size)
+        for message in messages[message_count:]:
+            line = json_dumps(message) + b"\n"
+            f.write(line)
+            log_size += len(line)
+
+    meta = {key: value for key, value in data.items() if key != "messages"}
+    meta["message_count"] = len(messages)
+    meta["log_size"] = log_size
+    meta_file.write_bytes(json_dumps(meta, indent=True))
+    (session_dir / LEGACY_SESSION_FILE).unlink(missing_ok=True)
+
+
+def find_sessions() -> list[tuple[Path, float]]:
+    """Find all sessions with their last-saved time, most recent first."""
+    if not SESSIONS_DIR.exists():
+        return []
+    sessions = []
+    for session_dir in SESSIONS_DIR.iterdir():
+        mtime = get_session_mtime(session_dir)
+        if mtime is not None:
+            sessions.append((session_dir, mtime))
+    sessions.sort(key=lambda session: session[1], reverse=True)
+    return sessions
 
 
 def get_latest_session() -> str | None:
     """Find the most recently modified session. Returns session name or None."""
-    if not SESSIONS_DIR.exists():
-        return None
-    sessions = [d for d in SESSIONS_DIR.iterdir() if d.is_dir() and (d / "session.json").exists()]
+    sessions = find_sessions()
     if not sessions:
         return None
-    # Sort by modification time of session.json
-    sessions.sort(key=lambda d: (d / "session.json").stat().st_mtime, reverse=True)
-    return sessions[0].name
+    return sessions[0][0].name
+
+
+def session_images(session_dir: Path) -> list[os.DirEntry]:
+    """List the images in a session folder with a single directory scan."""
+    with os.scandir(session_dir) as entries:
+        return [entry for entry in entries if entry.name.endswith(IMAGE_SUFFIXES)]
+
+
+def upload_session_image(image_path: Path, uploads: dict) -> str:
+    """Upload a session image, reusing a still-valid URL for identical content.
+
+    ``uploads`` maps SHA-1 digests to ``{"url", "uploaded"}`` and is updated in place.
+    """
+    with open(image_path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha1").hexdigest()
+    cached = uploads.get(digest)
+    if cached and time.time() - cached["uploaded"] < UPLOAD_REUSE_SECONDS:
+        return cached["url"]
+    url = upload_to_litterbox(image_path)
+    uploads[digest] = {"url": url, "uploaded": time.time()}
+    return url
+
+
+def session_image_url(image_path: Path, uploads: dict) -> str:
+    """Get a URL for a session image: a hosted copy if possible, else an inline data URL."""
+    import mimetypes
+
+    import requests
+
+    try:
+        return upload_session_image(image_path, uploads)
+    except requests.exceptions.RequestException:
+        mime_type = mimetypes.guess_type(image_path.name)[0] or "image/png"
+        return f"data:{mime_type};base64,{base64.b64encode(image_path.read_bytes()).decode()}"
+
+
+def resolve_session_images(session_dir: Path, messages: list[dict], uploads: dict) -> list[dict]:
+    """Replace persisted image_path parts with image_url parts the API can fetch."""
+    paths = sorted({
+        part["path"]
+        for message in messages
+        if isinstance(message.get("content"), list)
+        for part in message["content"]
+        if part.get("type") == "image_path"
+    })
+    if not paths:
+        return messages
+
+    urls: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=min(HTTP_POOL_SIZE, len(paths))) as executor:
+        futures = [executor.submit(session_image_url, session_dir / path, uploads) for path in paths]
+        for path, future in zip(paths, futures):
+            try:
+                urls[path] = future.result()
+            except OSError as e:
+                get_console().print(f"[yellow]Warning:[/yellow] Skipping previous image {path}: {e}")
+
+    resolved = []
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, list):
+            resolved.append(message)
+            continue
+        parts = []
+        for part in content:
+            if part.get("type") != "image_path":
+                parts.append(part)
+            elif part["path"] in urls:
+                parts.append({"type": "image_url", "image_url": {"url": urls[part["path"]]}})
+        resolved.append({**message, "content": parts})
+    return resolved
 
 
 def list_sessions() -> None:
     """Display all available sessions."""
-    if not SESSIONS_DIR.exists():
-        console.print("[yellow]No sessions found.[/yellow]")
-        return
+    from rich.table import Table
+
+    console = get_console()
 
-    sessions = [d for d in SESSIONS_DIR.iterdir() if d.is_dir() and (d / "session.json").exists()]
+    sessions = find_sessions()
     if not sessions:
         console.print("[yellow]No sessions found.[/yellow]")
         return
 
-    # Sort by modification time
-    sessions.sort(key=lambda d: (d / "session.json").stat().st_mtime, reverse=True)
-
     table = Table(title="Image Generation Sessions")
     table.add_column("Session", style="cyan")
     table.add_column("Model", style="dim")
@@ -169,19 +590,25 @@ def list_sessions() -> None:
     table.add_column("Images", justify="right")
     table.add_column("Last Modified", style="dim")
 
-    for session_dir in sessions:
-        data = load_session(session_dir.name)
-        if data:
+    for session_dir, mtime in sessions:
+        # The meta has everything shown here, so the message log is never read
+        try:
+            data = json_loads((session_dir / SESSION_META_FILE).read_bytes())
+            msg_count = data.get("message_count", 0)
+        except FileNotFoundError:
+            # Legacy single-file session: the messages must be parsed to count them
+            data = load_session(session_dir.name)
+            if not data:
+                continue
             msg_count = len(data.get("messages", []))
-            img_count = len(list(session_dir.glob("*.png"))) + len(list(session_dir.glob("*.jpg")))
-            mtime = datetime.fromtimestamp((session_dir / "session.json").stat().st_mtime)
-            table.add_row(
-                session_dir.name,
-                data.get("model", "unknown"),
-                str(msg_count),
-                str(img_count),
-                mtime.strftime("%Y-%m-%d %H:%M"),
-            )
+        img_count = len(session_images(session_dir))
+        table.add_row(
+            session_dir.name,
+            data.get("model", "unknown"),
+            str(msg_count),
+            str(img_count),
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)),
+        )
 
     console.print(table)
 
@@ -195,58 +622,114 @@ def delete_session(name: str) -> bool:
     return True
 
 
-def list_image_models() -> None:
-    """Fetch and display all models that support image output."""
-    api_key = load_api_key()
+# The subset of the /v1/models response that --list-models uses. With msgspec the
+# catalog is decoded against these types, skipping every other field.
+class ModelArchitecture(TypedDict, total=False):
+    output_modalities: list[Any] | None
+
+
+class ModelInfo(TypedDict, total=False):
+    id: str | None
+    name: str | None
+    context_length: Any
+    architecture: ModelArchitecture | None
+    pricing: dict[str, Any] | None
+
+
+class ModelsResponse(TypedDict, total=False):
+    data: list[ModelInfo]
+
 
+def decode_models(content: bytes) -> ModelsResponse:
+    """Decode a /v1/models response body, keeping only the fields listed above."""
+    if msgspec is not None:
+        return msgspec.json.decode(content, type=ModelsResponse)
+    return json_loads(content)
+
+
+def fetch_models(api_key: str, use_cache: bool = True) -> ModelsResponse:
+    """Fetch the OpenRouter model catalog, using or revalidating the cached copy when allowed."""
     headers = {
         "Authorization": f"Bearer {api_key}",
     }
 
+    cached: bytes | None = None
+    if use_cache:
+        try:
+            ttl = float(os.environ.get("OPENROUTER_MODELS_CACHE_TTL", DEFAULT_MODELS_CACHE_TTL))
+        except ValueError:
+            ttl = DEFAULT_MODELS_CACHE_TTL
+        try:
+            cached = MODELS_CACHE_FILE.read_bytes()
+            if time.time() - MODELS_CACHE_FILE.stat().st_mtime < ttl:
+                return decode_models(cached)
+            validators = json_loads(MODELS_VALIDATORS_FILE.read_bytes())
+        except (OSError, ValueError):
+            pass
+        else:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+    response = get_http_session().get(
+        "https://openrouter.ai/api/v1/models",
+        headers=headers,
+        timeout=30,
+    )
+    if response.status_code == 304 and cached is not None:
+        # Still current: restart the TTL without rewriting the body
+        try:
+            os.utime(MODELS_CACHE_FILE)
+        except OSError:
+            pass
+        return decode_models(cached)
+    response.raise_for_status()
+
+    # The cache is best effort; failing to write it must not fail the listing.
+    # The body is replaced atomically so a fresh-looking cache is never torn.
+    try:
+        MODELS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = MODELS_CACHE_FILE.with_suffix(".tmp")
+        tmp_file.write_bytes(response.content)
+        os.replace(tmp_file, MODELS_CACHE_FILE)
+        MODELS_VALIDATORS_FILE.write_bytes(json_dumps({
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }))
+    except OSError:
+        pass
+    return decode_models(response.content)
+
+
+def list_image_models(use_cache: bool = True) -> None:
+    """Fetch and display all models that support image output."""
+    import requests
+    from rich.table import Table
+
+    console = get_console()
+    api_key = load_api_key()
+
     with console.status("[bold blue]Fetching models...[/bold blue]"):
         try:
-            response = requests.get(
-                "https://openrouter.ai/api/v1/models",
-                headers=headers,
-                timeout=30,
-            )
-            response.raise_for_status()
-            result = response.json()
-        except requests.exceptions.RequestException as e:
+            result = fetch_models(api_key, use_cache=use_cache)
+        except (requests.exceptions.RequestException, ValueError) as e:
             console.print(f"[red]Error fetching models:[/red] {e}")
             sys.exit(1)
 
-    models = result.get("data", [])
-
-    # Filter to models with image output capability
-    image_models = [
-        m
-        for m in models
-        if "image" in m.get("architecture", {}).get("output_modalities", [])
-    ]
-
-    if not image_models:
-        console.print("[yellow]No image generation models found.[/yellow]")
-        return
-
-    # Sort by name
-    image_models.sort(key=lambda m: m.get("name", "").lower())
-
-    # Build table
-    table = Table(title=f"Image Generation Models ({len(image_models)} available)")
-    table.add_column("Model ID", style="cyan", no_wrap=True)
-    table.add_column("Name", style="white")
-    table.add_column("Context", justify="right", style="dim")
-    table.add_column("Pricing (per image)", justify="right", style="green")
+    # Filter to models with image output capability, building each table row in
+    # the same pass (prefixed with its sort key)
+    rows: list[tuple[str, str, str, str, str]] = []
+    for model in result.get("data") or ():
+        if "image" not in ((model.get("architecture") or {}).get("output_modalities") or ()):
+            continue
 
-    for model in image_models:
-        model_id = model.get("id", "")
-        name = model.get("name", "")
+        name = model.get("name") or ""
         context = model.get("context_length")
         context_str = f"{context:,}" if context else "-"
 
         # Get image output pricing
-        pricing = model.get("pricing", {})
+        pricing = model.get("pricing") or {}
         image_price = pricing.get("image_output") or pricing.get("image")
         if image_price:
             try:
@@ -260,6 +743,23 @@ def list_image_models() -> None:
         else:
             price_str = "-"
 
+        rows.append((name.lower(), model.get("id") or "", name, context_str, price_str))
+
+    if not rows:
+        console.print("[yellow]No image generation models found.[/yellow]")
+        return
+
+    # Sort by name
+    rows.sort(key=itemgetter(0))
+
+    # Build table
+    table = Table(title=f"Image Generation Models ({len(rows)} available)")
+    table.add_column("Model ID", style="cyan", no_wrap=True)
+    table.add_column("Name", style="white")
+    table.add_column("Context", justify="right", style="dim")
+    table.add_column("Pricing (per image)", justify="right", style="green")
+
+    for _, model_id, name, context_str, price_str in rows:
         table.add_row(model_id, name, context_str, price_str)
 
     console.print(table)
@@ -273,17 +773,26 @@ def generate_image(
     output_file: str | None = None,
     reference_images: list[Path] | None = None,
     session_name: str | None = None,
+    use_cache: bool = True,
 ) -> list[Path]:
     """Generate images using OpenRouter's chat completions API."""
+    from datetime import datetime
+
+    import requests
+    from rich.panel import Panel
+
+    console = get_console()
     api_key = load_api_key()
 
     # Load existing session if continuing
     session_data: dict | None = None
     messages: list[dict] = []
+    uploads: dict = {}
     if session_name:
         session_data = load_session(session_name)
         if session_data:
             messages = session_data.get("messages", [])
+            uploads = session_data.get("uploads", {})
             # Use session's model/config if not explicitly overridden
             if model == DEFAULT_MODEL and session_data.get("model"):
                 model = session_data["model"]
@@ -302,37 +811,68 @@ def generate_image(
     if image_size:
         console.print(f"[dim]Image size: {image_size}[/dim]")
 
+    # Plain prompts are answered from the image cache; sessions and reference
+    # images depend on more than the request key can describe. Without use_cache
+    # the lookup is skipped, but the new result still replaces the cached one.
+    cache_key: str | None = None
+    if not session_name and not reference_images:
+        cache_key = image_cache_key(model, prompt, aspect_ratio, image_size)
+        cached = cached_images(cache_key) if use_cache else []
+        if cached:
+            console.print("[dim]Using cached image (pass --no-cache to generate a new one)[/dim]")
+            OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+            saved_files = output_paths(output_file, len(cached))
+            for src, file_path in zip(cached, saved_files):
+                link_or_copy(src, file_path)
+            return saved_files
+
     # Upload reference images if provided
     reference_urls: list[str] = []
     if reference_images:
         console.print(f"[dim]Reference images: {len(reference_images)}[/dim]")
-        with console.status("[bold blue]Uploading reference images...[/bold blue]"):
-            for img_path in reference_images:
-                if not img_path.exists():
-                    console.print(f"[yellow]Warning:[/yellow] Reference image not found: {img_path}")
-                    continue
-                try:
-                    url = upload_to_litterbox(img_path)
-                    reference_urls.append(url)
-                    console.print(f"[dim]  Uploaded: {img_path.name}[/dim]")
-                except Exception as e:
-                    console.print(f"[yellow]Warning:[/yellow] Failed to upload {img_path.name}: {e}")
+        upload_paths: list[Path] = []
+        for img_path in reference_images:
+            if img_path.exists():
+                upload_paths.append(img_path)
+            else:
+                console.print(f"[yellow]Warning:[/yellow] Reference image not found: {img_path}")
+
+        if upload_paths:
+            with (
+                console.status("[bold blue]Uploading reference images...[/bold blue]"),
+                ThreadPoolExecutor(max_workers=min(HTTP_POOL_SIZE, len(upload_paths))) as executor,
+            ):
+                # Upload concurrently, but collect results in the original order
+                futures = [executor.submit(upload_to_litterbox, img_path) for img_path in upload_paths]
+                for img_path, future in zip(upload_paths, futures):
+                    try:
+                        reference_urls.append(future.result())
+                        console.print(f"[dim]  Uploaded: {img_path.name}[/dim]")
+                    except Exception as e:
+                        console.print(f"[yellow]Warning:[/yellow] Failed to upload {img_path.name}: {e}")
 
     # For continuing sessions, upload previous generated images so model can see them
     if session_name and session_data and not reference_urls:
         session_dir = get_session_dir(session_name)
-        prev_images = sorted(session_dir.glob("*.png")) + sorted(session_dir.glob("*.jpg"))
+        prev_images = session_images(session_dir)
         if prev_images:
-            # Upload the most recent image(s) for context
-            latest_image = prev_images[-1]
+            # Upload the most recent image for context
+            latest_image = Path(max(prev_images, key=lambda e: e.stat().st_mtime).path)
             console.print(f"[dim]Including previous image: {latest_image.name}[/dim]")
             with console.status("[bold blue]Uploading previous image for context...[/bold blue]"):
                 try:
-                    url = upload_to_litterbox(latest_image)
+                    url = upload_session_image(latest_image, uploads)
                     reference_urls.append(url)
                 except Exception as e:
                     console.print(f"[yellow]Warning:[/yellow] Failed to upload previous image: {e}")
 
+    # Session history stores generated images as file references; turn them back
+    # into URLs (reusing earlier uploads) for the request
+    history = messages
+    if session_name and session_data:
+        with console.status("[bold blue]Preparing session history...[/bold blue]"):
+            history = resolve_session_images(get_session_dir(session_name), messages, uploads)
+
     console.print()
 
     # Build message content - multimodal if we have reference images
@@ -350,17 +890,18 @@ def generate_image(
     else:
         content = prompt
 
-    # Add new user message to history
     new_user_message = {"role": "user", "content": content}
-    messages.append(new_user_message)
 
     # Build request payload
     payload = {
         "model": model,
-        "messages": messages,
+        "messages": [*history, new_user_message],
         "modalities": ["image", "text"],
     }
 
+    # Add new user message to history
+    messages.append(new_user_message)
+
     # Add image config if specified
     if aspect_ratio or image_size:
         payload["image_config"] = {}
@@ -372,24 +913,25 @@ def generate_image(
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
-        "HTTP-Referer": "https://github.com/anthropics/claude-code",
-        "X-Title": "Claude Code Image Generation",
     }
 
     with console.status("[bold blue]Generating image...[/bold blue]"):
         try:
-            response = requests.post(
+            response = get_http_session().post(
                 "https://openrouter.ai/api/v1/chat/completions",
                 headers=headers,
-                json=payload,
+                # Serialize ourselves: orjson is much faster than the stdlib json
+                # requests would use, and long session histories make this large
+                data=json_dumps(payload),
                 timeout=120,
+                stream=True,
             )
             response.raise_for_status()
-            result = response.json()
+            message = read_completion_message(response)
         except requests.exceptions.HTTPError as e:
             error_detail = ""
             try:
-                error_detail = response.json().get("error", {}).get("message", "")  # pyright: ignore[reportPossiblyUnboundVariable]
+                error_detail = json_loads(response.content).get("error", {}).get("message", "")  # pyright: ignore[reportPossiblyUnboundVariable]
             except Exception:
                 error_detail = response.text[:200]  # pyright: ignore[reportPossiblyUnboundVariable]
             console.print(
@@ -399,14 +941,15 @@ def generate_image(
         except requests.exceptions.RequestException as e:
             console.print(f"[red]Request Error:[/red] {e}")
             sys.exit(1)
+        except ValueError as e:
+            console.print(f"[red]Invalid API response:[/red] {e}")
+            sys.exit(1)
 
     # Extract images from response
-    choices = result.get("choices", [])
-    if not choices:
+    if message is None:
         console.print("[red]Error:[/red] No choices in response")
         sys.exit(1)
 
-    message = choices[0].get("message", {})
     images = message.get("images", [])
 
     # Also print any text content from the model
@@ -424,77 +967,62 @@ def generate_image(
     # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Generate base filename if not provided
-    if output_file:
-        base_name = Path(output_file).stem
-        extension = Path(output_file).suffix or ".png"
-    else:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = f"image_{timestamp}"
-        extension = ".png"
-
-    saved_files: list[Path] = []
-    session_image_files: list[str] = []  # Track image filenames for session
+    file_paths = output_paths(output_file, len(images))
+    jobs: list[tuple[int, str, Path]] = []
 
-    for i, image_data in enumerate(images):
-        # Determine filename
-        if len(images) == 1:
-            filename = f"{base_name}{extension}"
-        else:
-            filename = f"{base_name}_{i + 1}{extension}"
-
-        file_path = OUTPUT_DIR / filename
-
-        # Extract base64 data from data URL
+    for i, (image_data, file_path) in enumerate(zip(images, file_paths)):
         image_url = image_data.get("image_url", {}).get("url", "")
 
         if not image_url:
             console.print(f"[yellow]Warning:[/yellow] No image URL for result {i + 1}")
             continue
 
-        # Parse data URL (format: data:image/png;base64,<data>)
-        if image_url.startswith("data:"):
-            try:
-                # Split off the header
-                header, b64_data = image_url.split(",", 1)
-                image_bytes = base64.b64decode(b64_data)
-                file_path.write_bytes(image_bytes)
-                saved_files.append(file_path)
-                session_image_files.append(filename)
-            except Exception as e:
-                console.print(
-                    f"[yellow]Warning:[/yellow] Failed to decode image {i + 1}: {e}"
-                )
-        else:
-            # It's a regular URL, download it
-            try:
-                img_response = requests.get(image_url, timeout=30)
-                img_response.raise_for_status()
-                file_path.write_bytes(img_response.content)
-                saved_files.append(file_path)
-                session_image_files.append(filename)
-            except Exception as e:
-                console.print(
-                    f"[yellow]Warning:[/yellow] Failed to download image {i + 1}: {e}"
-                )
+        jobs.append((i, image_url, file_path))
+
+    saved_files: list[Path] = []
+    if jobs:
+        # Decode data URLs and download remote images concurrently, but collect
+        # results in the original order
+        with (
+            console.status("[bold blue]Saving images...[/bold blue]"),
+            ThreadPoolExecutor(max_workers=min(HTTP_POOL_SIZE, len(jobs))) as executor,
+        ):
+            futures = [executor.submit(save_image, url, path) for _, url, path in jobs]
+            for (i, image_url, file_path), future in zip(jobs, futures):
+                try:
+                    future.result()
+                    saved_files.append(file_path)
+                except Exception as e:
+                    action = "decode" if image_url.startswith("data:") else "download"
+                    console.print(
+                        f"[yellow]Warning:[/yellow] Failed to {action} image {i + 1}: {e}"
+                    )
+
+    # Only cache complete results, so a failed download isn't replayed later
+    if cache_key and saved_files and len(saved_files) == len(images):
+        try:
+            store_cached_images(cache_key, saved_files)
+        except OSError as e:
+            console.print(f"[yellow]Warning:[/yellow] Failed to cache images: {e}")
 
     # Save session state if using sessions
     if session_name:
+        # Prefix session copies with the turn's message index, so reusing an output
+        # name (e.g. -o cover.png every turn) never replaces an earlier turn's image
+        turn = len(messages)
+        session_image_files = [f"{turn:03d}_{file_path.name}" for file_path in saved_files]
+
         # Build assistant message with images as proper content parts
         assistant_content: list[dict] | str
-        if images:
+        if session_image_files:
             assistant_content = []
             # Include any text response
             if text_content:
                 assistant_content.append({"type": "text", "text": text_content})
-            # Include generated images with their base64 data URLs
-            for image_data in images:
-                image_url = image_data.get("image_url", {}).get("url", "")
-                if image_url:
-                    assistant_content.append({
-                        "type": "image_url",
-                        "image_url": {"url": image_url},
-                    })
+            # Reference generated images by their file in the session folder rather
+            # than embedding base64 data, which would be resent on every turn
+            for filename in session_image_files:
+                assistant_content.append({"type": "image_path", "path": filename})
         else:
             assistant_content = text_content or ""
 
@@ -504,35 +1032,39 @@ def generate_image(
         }
         messages.append(assistant_message)
 
+        # Only keep uploads whose URLs can still be reused; the rest have expired
+        now = time.time()
+        uploads = {
+            digest: upload
+            for digest, upload in uploads.items()
+            if now - upload["uploaded"] < UPLOAD_REUSE_SECONDS
+        }
+
         # Save session
         session_data = {
             "model": model,
             "aspect_ratio": aspect_ratio,
             "image_size": image_size,
             "messages": messages,
+            "uploads": uploads,
             "created": session_data.get("created") if session_data else datetime.now().isoformat(),
             "updated": datetime.now().isoformat(),
         }
         save_session(session_name, session_data)
 
-        # Copy images to session folder
+        # Link images into session folder
         session_dir = get_session_dir(session_name)
-        for file_path in saved_files:
-            dest = session_dir / file_path.name
-            shutil.copy2(file_path, dest)
+        for file_path, filename in zip(saved_files, session_image_files):
+            link_or_copy(file_path, session_dir / filename)
 
         console.print(f"[dim]Session saved: {session_name}[/dim]")
 
     return saved_files
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate images using OpenRouter's API.",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=f"""
+HELP_EPILOG = f"""
 Aspect ratios:
-  {", ".join(ASPECT_RATIOS.keys())}
+  {", ".join(ASPECT_RATIO_KEYS)}
 
 Image sizes (Gemini only):
   {", ".join(IMAGE_SIZES)}
@@ -542,7 +1074,14 @@ Examples:
   %(prog)s -a 16:9 -o landscape.png "Mountain at sunset"
   %(prog)s -a 1:1 -s 4K "High resolution portrait"
   %(prog)s --list-models
-        """,
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate images using OpenRouter's API.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=HELP_EPILOG,
     )
     parser.add_argument(
         "prompt",
@@ -555,6 +1094,12 @@ Examples:
         action="store_true",
         help="List all available image generation models",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached results: refetch the model list, or generate a new image "
+        "instead of reusing one from an identical earlier request",
+    )
     parser.add_argument(
         "-o",
         "--output",
@@ -563,7 +1108,7 @@ Examples:
     parser.add_argument(
         "-a",
         "--aspect-ratio",
-        choices=list(ASPECT_RATIOS.keys()),
+        choices=ASPECT_RATIO_KEYS,
         help="Aspect ratio for the image",
     )
     parser.add_argument(
@@ -613,6 +1158,10 @@ Examples:
 
     args = parser.parse_args()
 
+    from rich.panel import Panel
+
+    console = get_console()
+
     if args.list_sessions:
         list_sessions()
         return
@@ -625,7 +1174,7 @@ Examples:
         return
 
     if args.list_models:
-        list_image_models()
+        list_image_models(use_cache=not args.no_cache)
         return
 
     if not args.prompt:
@@ -647,6 +1196,7 @@ Examples:
         output_file=args.output,
         reference_images=args.reference_images,
         session_name=session_name,
+        use_cache=not args.no_cache,
     )
 
     if saved_files: